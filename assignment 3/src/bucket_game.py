@@ -1,4 +1,7 @@
 import math
+import sys
+
+from game_engine import negamax_search
 
 State = tuple [int, list[str | int]] # Tuple of player ( whose turn it is ) , and the buckets ( as str ) or the number in a bucket
 Action = str | int # Bucket choice ( as str ) or choice of number
@@ -79,14 +82,20 @@ def minimax_search(game: Game, state: State) -> Action | None:
 
 
 
-game = Game()
+def main():
+    game = Game()
+    search = negamax_search if '--engine' in sys.argv else minimax_search  # --engine switches to game_engine
 
-state = game.initial_state()
-game.print(state)
-while not game.is_terminal(state):
-    player = game.to_move(state)
-    action = minimax_search(game, state) # The player whose turn it is, is the MAX player
-    print(f'P{player + 1}\'s action : { action }')
-    assert action is not None
-    state = game.result(state, action)
-    game.print(state)
\ No newline at end of file
+    state = game.initial_state()
+    game.print(state)
+    while not game.is_terminal(state):
+        player = game.to_move(state)
+        action = search(game, state) # The player whose turn it is, is the MAX player
+        print(f'P{player + 1}\'s action : { action }')
+        assert action is not None
+        state = game.result(state, action)
+        game.print(state)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Protocol
+import math
+import time
+
+State = Any  # Whatever state type the game uses
+Action = Any  # Whatever action type the game uses
+
+# Flags of cached values: the exact value, or only a lower or upper bound because of a cutoff
+EXACT, LOWER, UPPER = 0, 1, 2
+# Cache entries are (depth, value, flag, horizon reached), the last telling whether the search of the entry
+# stopped at the depth limit anywhere below it, so that a value read from the cache keeps deepening going
+
+
+class Game(Protocol):
+    """The interface shared by the Game classes of the game modules."""
+
+    def to_move(self, state: State) -> int: ...
+
+    def actions(self, state: State) -> list[Action]: ...
+
+    def result(self, state: State, action: Action) -> State: ...
+
+    def is_terminal(self, state: State) -> bool: ...
+
+    def utility(self, state: State, player: int) -> float: ...
+
+
+class BudgetExceeded(Exception):
+    """Raised inside the search when the time or node budget is used up."""
+
+
+class LRUCache:
+
+    def __init__(self, maxsize: int):
+        """Constructs a cache that evicts the least recently used entry when it holds more than maxsize entries.
+
+        Parameters
+        ----------
+        maxsize : int
+            The maximum number of entries
+        """
+        self.maxsize = maxsize
+        self.entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def freeze(state: State) -> Hashable:
+    """Default cache key of a state: the state with all lists turned into tuples."""
+    if isinstance(state, (list, tuple)):
+        return tuple(freeze(item) for item in state)
+    return state
+
+
+class SearchEngine:
+
+    def __init__(
+        self,
+        game: Game,
+        cache: Any = None,
+        pruning: bool = True,
+        depth_limit: int | None = None,
+        time_limit: float | None = None,
+        node_limit: int | None = None,
+        key=freeze,
+    ):
+        """Constructs a negamax search engine for any game following the Game protocol.
+
+        Parameters
+        ----------
+        game : Game
+            The game to search, utility(state, player) must be equal to -utility(state, other player)
+        cache : Any
+            Memo cache of searched states, a dict, an LRUCache or anything else with get() and item
+            assignment. None disables caching. The cache can be shared between searches and engines.
+        pruning : bool
+            Whether to use alpha-beta pruning
+        depth_limit : int | None
+            The maximum number of moves to look ahead, None for no limit. Positions at the limit are scored
+            with game.evaluate(state, player), which the game must then provide.
+        time_limit : float | None
+            The maximum number of seconds per search, None for no limit
+        node_limit : int | None
+            The maximum number of nodes per search, None for no limit
+        key : Callable[[State], Hashable]
+            Function turning a state into a cache key
+        """
+        self.game = game
+        self.cache = cache
+        self.pruning = pruning
+        self.depth_limit = depth_limit
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.key = key
+
+        # Counters of the last search
+        self.nodes = 0
+        self.cutoffs = 0
+        self.cache_hits = 0
+        self.depth = 0
+        self.value = -math.inf
+        self.elapsed = 0.0
+
+    def negamax(self, state: State, depth: float, alpha: float, beta: float) -> float:
+        """Returns the value of the state for the player to move, searched to the given depth.
+
+        With pruning the value is exact if it is strictly between alpha and beta, otherwise it is a bound.
+        """
+        if self.nodes >= self.max_nodes or time.perf_counter() > self.deadline:
+            raise BudgetExceeded()
+        self.nodes += 1
+
+        player = self.game.to_move(state)
+        if self.game.is_terminal(state):
+            return self.game.utility(state, player)
+        if depth <= 0:
+            self.horizon_reached = True
+            return self.game.evaluate(state, player)
+
+        if self.cache is not None:
+            key = self.key(state)
+            entry = self.cache.get(key)
+            if entry is not None and entry[0] >= depth:
+                _, value, flag, horizon_reached = entry
+                if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                    self.cache_hits += 1
+                    self.horizon_reached |= horizon_reached
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+
+        # Whether this subtree reaches the depth limit is tracked apart from the rest of the search
+        outer_horizon_reached = self.horizon_reached
+        self.horizon_reached = False
+        original_alpha = alpha
+        v = -math.inf
+        for action in self.game.actions(state):
+            v = max(v, -self.negamax(self.game.result(state, action), depth - 1, -beta, -alpha))
+            if self.pruning:
+                alpha = max(alpha, v)
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    break
+        horizon_reached = self.horizon_reached
+        self.horizon_reached = outer_horizon_reached or horizon_reached
+
+        if self.cache is not None:
+            if v <= original_alpha:
+                flag = UPPER
+            elif v >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.cache[key] = (depth, v, flag, horizon_reached)
+        return v
+
+    def search_root(self, state: State, depth: float, first: Action | None) -> tuple[Action | None, float]:
+        """Searches every action of the state to the given depth, the first action given first.
+
+        Returns
+        -------
+        tuple[Action | None, float]
+            The first of the best actions and its value for the player to move
+        """
+        # Sorted into a new list, as some games (like the bucket game) return a list stored in the state
+        actions = self.game.actions(state)
+        if first is not None:
+            actions = sorted(actions, key=lambda action: action != first)
+        best_score = -math.inf
+        best_action = None
+        alpha = -math.inf
+        for action in actions:
+            value = -self.negamax(self.game.result(state, action), depth - 1, -math.inf, -alpha)
+            # Like minimax_search, the first of the best actions is chosen
+            if value > best_score:
+                best_score = value
+                best_action = action
+                self.partial_action = action
+            if self.pruning:
+                alpha = max(alpha, best_score)
+        return best_action, best_score
+
+    def search(self, state: State) -> Action | None:
+        """Chooses an action for the player to move.
+
+        Without a time or node budget the state is searched once to the depth limit. With a budget a game
+        with an evaluation is searched with iterative deepening, and the action of the deepest search that
+        finished is returned. A game without an evaluation is searched once, and if the budget runs out the
+        best action found so far is returned.
+
+        Returns
+        -------
+        Action | None
+            The best action found, None if the state is terminal
+        """
+        self.nodes = 0
+        self.cutoffs = 0
+        self.cache_hits = 0
+        self.depth = 0
+        self.value = -math.inf
+        start_time = time.perf_counter()
+        self.deadline = math.inf if self.time_limit is None else start_time + self.time_limit
+        self.max_nodes = math.inf if self.node_limit is None else self.node_limit
+        if self.game.is_terminal(state):
+            return None
+
+        max_depth = math.inf if self.depth_limit is None else self.depth_limit
+        iterative = (self.time_limit is not None or self.node_limit is not None) and hasattr(self.game, 'evaluate')
+        depth = 1 if iterative else max_depth
+        best_action = None
+        self.partial_action = None
+        while depth <= max_depth:
+            self.horizon_reached = False
+            try:
+                best_action, self.value = self.search_root(state, depth, best_action)
+            except BudgetExceeded:
+                if not iterative:
+                    best_action = self.partial_action
+                break
+            self.depth = depth
+            # Stop once the whole remaining game fit within the depth
+            if not iterative or not self.horizon_reached:
+                break
+            depth += 1
+        if best_action is None:  # The budget ran out before a single search finished
+            best_action = self.game.actions(state)[0]
+        self.elapsed = time.perf_counter() - start_time
+        return best_action
+
+
+def negamax_search(game: Game, state: State, **options) -> Action | None:
+    """Drop-in replacement for the minimax_search and alpha_beta_search functions of the game modules.
+
+    The keyword options are passed on to SearchEngine. Unless a cache is given, each call gets its own.
+    """
+    options.setdefault('cache', {})
+    return SearchEngine(game, **options).search(state)
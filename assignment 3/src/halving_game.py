@@ -1,4 +1,7 @@
 import math
+import sys
+
+from game_engine import negamax_search
 
 State = tuple [int, int] # Tuple of player (whose turn it is), and the number to be decreased
 Action = str # Decrement (number <- number -1) or halve (number <- number / 2)
@@ -83,18 +86,24 @@ def minimax_search(game: Game, state: State) -> Action | None:
 
     
     
-game = Game(5)
+def main():
+    game = Game(5)
+    search = negamax_search if '--engine' in sys.argv else minimax_search  # --engine switches to game_engine
 
-state = game.initial_state()
-game.print(state)
-while not game.is_terminal(state):
-    player = game.to_move(state)
-    action = minimax_search(game, state) # The player whose turn it is, is the MAX player
-    print(f'P{player + 1}\'s action : { action }')
-    assert action is not None
-    state = game.result(state, action)
+    state = game.initial_state()
     game.print(state)
-    
+    while not game.is_terminal(state):
+        player = game.to_move(state)
+        action = search(game, state) # The player whose turn it is, is the MAX player
+        print(f'P{player + 1}\'s action : { action }')
+        assert action is not None
+        state = game.result(state, action)
+        game.print(state)
+
+
+if __name__ == '__main__':
+    main()
+
 # Expected output :
 # The number is 5 and it is P1 ’s turn
 # P1 ’s action : --
@@ -104,4 +113,4 @@ while not game.is_terminal(state):
 # P1 ’s action : /2
 # The number is 1 and it is P2 ’s turn
 # P2 ’s action : --
-# The number is 0 and P1 won
\ No newline at end of file
+# The number is 0 and P1 won
@@ -0,0 +1,87 @@
+from functools import lru_cache
+import time
+
+State = tuple[int, int]  # Tuple of player (whose turn it is), and the number to be decreased
+Action = str  # Decrement (number <- number -1) or halve (number <- number / 2)
+
+
+class HalvingSolver:
+
+    def __init__(self, limit: int = 1 << 20, cache_size: int = 1 << 12):
+        """Solves the halving game for every number up to limit, and lazily for larger numbers.
+
+        Parameters
+        ----------
+        limit : int
+            Numbers up to limit are solved bottom-up into a table when the solver is constructed
+        cache_size : int
+            Maximum number of memoized values of numbers above limit
+        """
+        self.limit = limit
+
+        # wins[number] is 1 if the player to move wins from number. The player to move at 0 has won,
+        # otherwise a number is won if one of the two moves leads to a number that is lost.
+        self.wins = bytearray(limit + 1)
+        self.wins[0] = 1
+        for number in range(1, limit + 1):
+            self.wins[number] = not self.wins[number - 1] or not self.wins[number // 2]
+
+        self.lazy_wins = lru_cache(maxsize=cache_size)(self.solve_lazily)
+
+    def solve_lazily(self, number: int) -> bool:
+        # Top-down for numbers beyond the table, using that every odd number from 3 on is won and every even
+        # number from 4 on is won exactly when its half is lost. By induction: if 2m - 1 is won, 2m is won
+        # exactly when m is lost, so one of 2m and m is lost and 2m + 1 can move to it. This takes log2(number)
+        # steps instead of walking down through every smaller number.
+        if number <= self.limit:
+            return bool(self.wins[number])
+        if number == 1:  # Beyond the table only when limit is 0. The only move leads to 0, where the opponent won.
+            return False
+        if number % 2 == 1:
+            return True
+        return not self.lazy_wins(number // 2)
+
+    def is_win(self, number: int) -> bool:
+        """Returns True if the player to move wins from number with perfect play."""
+        return self.lazy_wins(number)
+
+    def best_action(self, state: State) -> Action | None:
+        """Returns the action minimax_search would choose: the first of '--' and '/2' that wins, or '--' if none does."""
+        _, number = state
+        if number == 0:
+            return None
+        if not self.is_win(number - 1):
+            return '--'
+        if not self.is_win(number // 2):
+            return '/2'
+        return '--'
+
+
+def benchmark():
+    """Compares the solver with the plain minimax recursion of halving_game.py."""
+    from halving_game import Game, minimax_search
+
+    print(f'{"N":>12} {"minimax s":>12} {"solver s":>12} {"action":>8}')
+    for number in (10, 25, 50, 100, 150):
+        game = Game(number)
+        start_time = time.perf_counter()
+        action = minimax_search(game, game.initial_state())
+        minimax_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        solver_action = HalvingSolver(limit=number).best_action(game.initial_state())
+        solver_time = time.perf_counter() - start_time
+        assert action == solver_action
+        print(f'{number:>12} {minimax_time:>12.4f} {solver_time:>12.6f} {action:>8}')
+
+    start_time = time.perf_counter()
+    solver = HalvingSolver()
+    print(f'Solving the table up to {solver.limit}: {time.perf_counter() - start_time:.4f} s')
+    for number in (10 ** 6, 10 ** 9, 10 ** 9 + 7, 2 ** 40, 10 ** 18):
+        start_time = time.perf_counter()
+        action = solver.best_action((0, number))
+        solver_time = time.perf_counter() - start_time
+        print(f'{number:>20} {"-":>12} {solver_time:>12.6f} {action:>8}')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,245 @@
+from concurrent.futures import ProcessPoolExecutor
+import math
+import random
+import time
+
+from game_engine import Action, Game, State
+
+# Worker process game, set once per worker by init_worker
+worker_game: Game | None = None
+
+
+def init_worker(game: Game):
+    global worker_game
+    worker_game = game
+
+
+def random_playouts(game: Game, state: State, count: int, seed: int) -> tuple[float, float]:
+    """Plays count random games from the state.
+
+    Returns
+    -------
+    tuple[float, float]
+        The total score of P1 and of P2 over the games, 1 for a win and 0.5 for a draw. Only the sign of the
+        utility counts, so that games with large utilities (like the bucket game) do not drown the exploration.
+    """
+    rng = random.Random(seed)
+    scores = [0.0, 0.0]
+    for _ in range(count):
+        playout_state = state
+        while not game.is_terminal(playout_state):
+            playout_state = game.result(playout_state, rng.choice(game.actions(playout_state)))
+        utility = game.utility(playout_state, 0)
+        if utility > 0:
+            scores[0] += 1
+        elif utility < 0:
+            scores[1] += 1
+        else:
+            scores[0] += 0.5
+            scores[1] += 0.5
+    return scores[0], scores[1]
+
+
+def worker_playouts(state: State, count: int, seed: int) -> tuple[float, float]:
+    return random_playouts(worker_game, state, count, seed)
+
+
+class Node:
+    __slots__ = ('state', 'parent', 'action', 'player', 'children', 'untried', 'visits', 'score')
+
+    def __init__(self, state: State, parent: 'Node | None', action: Action | None, player: int, untried: list[Action]):
+        self.state = state
+        self.parent = parent
+        self.action = action  # The action leading from the parent to this node
+        self.player = player  # The player who made that action, whose point of view score is from
+        self.children: list[Node] = []
+        self.untried = untried
+        self.visits = 0
+        self.score = 0.0
+
+
+class MCTS:
+
+    def __init__(
+        self,
+        game: Game,
+        iterations: int | None = None,
+        time_limit: float | None = None,
+        exploration: float = math.sqrt(2),
+        batch_size: int = 1,
+        workers: int = 0,
+        seed: int | None = None,
+    ):
+        """Constructs a Monte Carlo Tree Search (UCT) player for any game following the Game protocol.
+
+        Parameters
+        ----------
+        game : Game
+            The game being played
+        iterations : int | None
+            The number of iterations (selection, expansion, playouts, backpropagation) per search
+        time_limit : float | None
+            The maximum number of seconds per search, at least one of iterations and time_limit must be given
+        exploration : float
+            The exploration constant of UCT
+        batch_size : int
+            The number of random playouts from every expanded node
+        workers : int
+            The number of worker processes the playouts of a batch are split over, 0 to play them in this
+            process. Only worth it when batches are large enough to outweigh sending the state to the workers.
+        seed : int | None
+            Seed of the random number generator
+        """
+        assert iterations is not None or time_limit is not None, 'MCTS needs an iteration or a time budget'
+        self.game = game
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.batch_size = batch_size
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.executor = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(game,)) if workers else None
+        self.root: Node | None = None
+
+        # Counters of the last search
+        self.iterations_done = 0
+        self.playouts = 0
+        self.reused_visits = 0
+        self.elapsed = 0.0
+
+    def __enter__(self) -> 'MCTS':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def new_node(self, state: State, parent: Node | None, action: Action | None, player: int) -> Node:
+        untried = [] if self.game.is_terminal(state) else list(self.game.actions(state))
+        self.rng.shuffle(untried)
+        return Node(state, parent, action, player, untried)
+
+    def find_root(self, state: State) -> Node:
+        """Returns the node of the state from the previous search tree if it is there, otherwise a new root.
+
+        The state is looked for up to two moves below the previous root, which covers the usual case of
+        the opponent answering the move of the previous search.
+        """
+        if self.root is not None:
+            frontier = [self.root]
+            for _ in range(3):
+                for node in frontier:
+                    if node.state == state:
+                        node.parent = None  # Let the rest of the old tree be garbage collected
+                        return node
+                frontier = [child for node in frontier for child in node.children]
+        return self.new_node(state, None, None, (self.game.to_move(state) + 1) % 2)
+
+    def playout(self, state: State) -> tuple[float, float]:
+        if self.executor is None:
+            return random_playouts(self.game, state, self.batch_size, self.rng.getrandbits(32))
+        counts = [self.batch_size // self.workers + (i < self.batch_size % self.workers) for i in range(self.workers)]
+        futures = [
+            self.executor.submit(worker_playouts, state, count, self.rng.getrandbits(32)) for count in counts if count
+        ]
+        scores = [future.result() for future in futures]
+        return sum(score[0] for score in scores), sum(score[1] for score in scores)
+
+    def select_child(self, node: Node) -> Node:
+        log_visits = math.log(node.visits)
+        best_child = None
+        best_value = -math.inf
+        for child in node.children:
+            value = child.score / child.visits + self.exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best_child = child
+        return best_child
+
+    def search(self, state: State) -> Action | None:
+        """Chooses an action for the player to move within the iteration and time budget.
+
+        Returns
+        -------
+        Action | None
+            The most visited action, None if the state is terminal, a random action if no iteration finished
+        """
+        start_time = time.perf_counter()
+        if self.game.is_terminal(state):
+            return None
+        root = self.find_root(state)
+        self.root = root
+        self.reused_visits = root.visits
+        self.iterations_done = 0
+        self.playouts = 0
+        deadline = math.inf if self.time_limit is None else start_time + self.time_limit
+        max_iterations = math.inf if self.iterations is None else self.iterations
+
+        while self.iterations_done < max_iterations and time.perf_counter() < deadline:
+            # Selection: follow UCT down while the nodes are fully expanded
+            node = root
+            while not node.untried and node.children:
+                node = self.select_child(node)
+            # Expansion: add one untried action of the node
+            if node.untried:
+                action = node.untried.pop()
+                child = self.new_node(self.game.result(node.state, action), node, action, self.game.to_move(node.state))
+                node.children.append(child)
+                node = child
+            # Simulation: a batch of random playouts, or the result itself on terminal nodes
+            if self.game.is_terminal(node.state):
+                utility = self.game.utility(node.state, 0)
+                score = 1.0 if utility > 0 else 0.0 if utility < 0 else 0.5
+                visits, scores = self.batch_size, (score * self.batch_size, (1 - score) * self.batch_size)
+            else:
+                visits, scores = self.batch_size, self.playout(node.state)
+                self.playouts += self.batch_size
+            # Backpropagation
+            while node is not None:
+                node.visits += visits
+                node.score += scores[node.player]
+                node = node.parent
+            self.iterations_done += 1
+
+        self.elapsed = time.perf_counter() - start_time
+        if not root.children:  # The budget ran out before a single iteration, the actions are in random order
+            return root.untried[-1]
+        best_child = max(root.children, key=lambda child: child.visits)
+        return best_child.action
+
+
+def benchmark():
+    """Shows the iterations per second of the variants, and plays MCTS against alpha-beta on tic-tac-toe."""
+    from mnk_game import Game as MnkGame, alpha_beta_search
+
+    game = MnkGame(7, 7, 5)
+    state = game.initial_state()
+    print(f'{"workers":>8} {"batch":>6} {"iterations/s":>13} {"playouts/s":>11} {"action":>8}')
+    for workers, batch_size in ((0, 1), (0, 8), (2, 8), (2, 64)):
+        with MCTS(game, time_limit=1.0, batch_size=batch_size, workers=workers, seed=0) as player:
+            action = player.search(state)
+            print(f'{workers:>8} {batch_size:>6} {player.iterations_done / player.elapsed:>13.0f} '
+                  f'{player.playouts / player.elapsed:>11.0f} {str(action):>8}')
+
+    game = MnkGame()
+    with MCTS(game, time_limit=0.2, seed=0) as player:
+        results = {1: 0, 0: 0, -1: 0}
+        for mcts_player in (0, 1) * 5:
+            state = game.initial_state()
+            while not game.is_terminal(state):
+                if game.to_move(state) == mcts_player:
+                    action = player.search(state)
+                else:
+                    action = alpha_beta_search(game, state)
+                state = game.result(state, action)
+            results[game.utility(state, mcts_player)] += 1
+        print(f'MCTS (0.2 s per move) against full alpha-beta on tic-tac-toe: '
+              f'{results[1]} wins, {results[0]} draws, {results[-1]} losses, '
+              f'{player.reused_visits} visits reused on the last move')
+
+
+if __name__ == '__main__':
+    benchmark()
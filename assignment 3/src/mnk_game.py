@@ -0,0 +1,312 @@
+import math
+import time
+
+# Tuple of player (whose turn it is), flat row-major board, per-window piece counts of each player,
+# incremental evaluation from P1's point of view and the winner (if any)
+State = tuple[int, tuple[int | None, ...], tuple[tuple[int, ...], tuple[int, ...]], float, int | None]
+Action = tuple[int, int]  # Where to place the player's piece
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time limit of a time-limited search is exceeded."""
+
+
+class Game:
+
+    def __init__(self, m: int = 3, n: int = 3, k: int = 3):
+        """Constructs an m,n,k game: an m x n board where the first player to get k in a row wins.
+
+        Parameters
+        ----------
+        m : int
+            The number of rows of the board
+        n : int
+            The number of columns of the board
+        k : int
+            The number of pieces in a row needed to win
+        """
+        self.m = m
+        self.n = n
+        self.k = k
+
+        # Every segment of k cells in a row, column or diagonal is a window that can still be won.
+        # The evaluation only looks at windows, and each cell knows which windows it belongs to, so that
+        # a move only has to update the (at most 4 * k) windows that go through the played cell.
+        self.windows: list[tuple[int, ...]] = []
+        for row in range(m):
+            for col in range(n):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row, end_col = row + d_row * (k - 1), col + d_col * (k - 1)
+                    if 0 <= end_row < m and 0 <= end_col < n:
+                        self.windows.append(tuple((row + d_row * i) * n + col + d_col * i for i in range(k)))
+        self.cell_windows: list[list[int]] = [[] for _ in range(m * n)]
+        for window, cells in enumerate(self.windows):
+            for cell in cells:
+                self.cell_windows[cell].append(window)
+
+        # Weight of a window holding c pieces of a single player, so that one open k-1 threat is worth more
+        # than any number of weaker ones on the board, as there are fewer windows than the base
+        self.weights = [0] + [(len(self.windows) + 1) ** c for c in range(k - 1)]
+
+    def initial_state(self) -> State:
+        empty_counts = (0,) * len(self.windows)
+        return 0, (None,) * (self.m * self.n), (empty_counts, empty_counts), 0.0, None
+
+    def from_board(self, board: list[list[int | None]], player: int) -> State:
+        """Returns the state with the given board (as in the tic-tac-toe modules) and player to move."""
+        state = self.initial_state()
+        for row in range(self.m):
+            for col in range(self.n):
+                if board[row][col] is not None:
+                    # Place the piece as if it was its owner's turn
+                    state = self.result((board[row][col],) + state[1:], (row, col))
+        return (player,) + state[1:]
+
+    def to_move(self, state: State) -> int:
+        player_index, *_ = state
+        return player_index
+
+    def actions(self, state: State) -> list[Action]:
+        _, board, *_ = state
+        return [divmod(cell, self.n) for cell, piece in enumerate(board) if piece is None]
+
+    def result(self, state: State, action: Action) -> State:
+        player, board, counts, score, winner = state
+        row, col = action
+        cell = row * self.n + col
+        next_board = list(board)
+        next_board[cell] = player
+        own, other = list(counts[player]), counts[(player + 1) % 2]
+        sign = 1 if player == 0 else -1
+        # Only the windows through the played cell change, update their counts and the evaluation
+        for window in self.cell_windows[cell]:
+            own[window] += 1
+            if own[window] == self.k:
+                winner = player
+            elif other[window] == 0:
+                score += sign * (self.weights[own[window]] - self.weights[own[window] - 1])
+            elif own[window] == 1:
+                # The window was the opponent's threat, now it is blocked
+                score += sign * self.weights[other[window]]
+        next_counts = (tuple(own), other) if player == 0 else (other, tuple(own))
+        return (player + 1) % 2, tuple(next_board), next_counts, score, winner
+
+    def is_winner(self, state: State, player: int) -> bool:
+        *_, winner = state
+        return winner == player
+
+    def is_terminal(self, state: State) -> bool:
+        _, board, _, _, winner = state
+        return winner is not None or None not in board
+
+    def utility(self, state: State, player: int) -> float:
+        assert self.is_terminal(state)
+        if self.is_winner(state, player):
+            return 1
+        if self.is_winner(state, (player + 1) % 2):
+            return -1
+        return 0
+
+    def evaluate(self, state: State, player: int) -> float:
+        """Heuristic value of the state for the player, strictly between the loss (-1) and win (1) utilities."""
+        if self.is_terminal(state):
+            return self.utility(state, player)
+        _, _, _, score, _ = state
+        if player != 0:
+            score = -score
+        return score / (1 + abs(score))
+
+    def print(self, state: State):
+        _, board, *_ = state
+        print()
+        for row in range(self.m):
+            cells = [
+                ' ' if board[row * self.n + col] is None else 'x' if board[row * self.n + col] == 0 else 'o'
+                for col in range(self.n)
+            ]
+            print(' ' + ' | '.join(cells))
+            if row < self.m - 1:
+                print('+'.join(['---'] * self.n))
+        print()
+        if self.is_terminal(state):
+            if self.utility(state, 0) > 0:
+                print(f'P1 won')
+            elif self.utility(state, 1) > 0:
+                print(f'P2 won')
+            else:
+                print('The game is a draw')
+        else:
+            print(f'It is P{self.to_move(state)+1}\'s turn to move')
+
+
+def ordered_children(game: Game, state: State, player: int, maximize: bool) -> list[tuple[Action, State]]:
+    """Returns the (action, resulting state) pairs of the state, most promising first for the player to move.
+
+    Ordering by the incremental evaluation is cheap, since it is already part of every resulting state,
+    and it lets alpha-beta prune far more of the tree on the larger boards.
+    """
+    children = [(action, game.result(state, action)) for action in game.actions(state)]
+    children.sort(key=lambda child: game.evaluate(child[1], player), reverse=maximize)
+    return children
+
+
+def max_value(game: Game, state: State, depth: float, alpha: float, beta: float, player: int, deadline: float) -> float:
+    if game.is_terminal(state):  # Check if the game is over
+        return game.utility(state, player)  # Return the utility value of the terminal state
+    if depth <= 0:  # Cutoff, estimate the value with the evaluation function
+        return game.evaluate(state, player)
+    if time.perf_counter() > deadline:
+        raise SearchTimeout()
+    v = -math.inf
+    for _, next_state in ordered_children(game, state, player, True):
+        v = max(v, min_value(game, next_state, depth - 1, alpha, beta, player, deadline))  # Get the maximum value
+        if v >= beta:  # Beta cutoff
+            return v
+        alpha = max(alpha, v)  # Update alpha
+    return v
+
+
+def min_value(game: Game, state: State, depth: float, alpha: float, beta: float, player: int, deadline: float) -> float:
+    if game.is_terminal(state):  # Check if the game is over
+        return game.utility(state, player)  # Return the utility value of the terminal state
+    if depth <= 0:  # Cutoff, estimate the value with the evaluation function
+        return game.evaluate(state, player)
+    if time.perf_counter() > deadline:
+        raise SearchTimeout()
+    v = math.inf
+    for _, next_state in ordered_children(game, state, player, False):
+        v = min(v, max_value(game, next_state, depth - 1, alpha, beta, player, deadline))  # Get the minimum value
+        if v <= alpha:  # Alpha cutoff
+            return v
+        beta = min(beta, v)  # Update beta
+    return v
+
+
+def search_root(
+    game: Game,
+    state: State,
+    depth: float,
+    deadline: float = math.inf,
+    first: Action | None = None,
+) -> tuple[Action | None, float]:
+    """Alpha-beta search of the state to the given depth.
+
+    Parameters
+    ----------
+    game : Game
+        The game being played
+    state : State
+        The state to search from, the player to move is the MAX player
+    depth : float
+        The number of moves to search before cutting off with the evaluation, math.inf for a full search
+    deadline : float
+        time.perf_counter() value after which SearchTimeout is raised
+    first : Action | None
+        Action to search first, typically the best action of a shallower search
+
+    Returns
+    -------
+    tuple[Action | None, float]
+        The best action and its value
+    """
+    player = game.to_move(state)
+    children = ordered_children(game, state, player, True)
+    if first is not None:
+        children.sort(key=lambda child: child[0] != first)
+
+    best_score = -math.inf
+    best_action = None
+    alpha = -math.inf
+    beta = math.inf
+    for action, next_state in children:  # Iterate over all possible actions
+        value = min_value(game, next_state, depth - 1, alpha, beta, player, deadline)  # Get the value of the action
+        if value > best_score:  # Check if this action has the best score
+            best_score = value
+            best_action = action
+        alpha = max(alpha, best_score)  # Update alpha
+    return best_action, best_score
+
+
+def alpha_beta_search(
+    game: Game,
+    state: State,
+    depth_limit: int | None = None,
+    time_limit: float | None = None,
+) -> Action | None:
+    """Chooses an action for the player to move with alpha-beta search.
+
+    Without limits the whole game tree is searched, which is only feasible on small boards. With a depth
+    limit the search is cut off after depth_limit moves and the positions there are scored with the
+    incremental line-threat evaluation. With a time limit the search deepens iteratively and returns
+    the best action of the deepest search that finished in time.
+
+    Parameters
+    ----------
+    game : Game
+        The game being played
+    state : State
+        The state to search from, the player to move is the MAX player
+    depth_limit : int | None
+        The maximum number of moves to look ahead, None for no limit
+    time_limit : float | None
+        The maximum number of seconds to search for, None for no limit
+
+    Returns
+    -------
+    Action | None
+        The best action found, None if the state is terminal
+    """
+    if game.is_terminal(state):
+        return None
+    max_depth = math.inf if depth_limit is None else depth_limit
+    if time_limit is None:
+        best_action, _ = search_root(game, state, max_depth)
+        return best_action
+
+    deadline = time.perf_counter() + time_limit
+    _, board, *_ = state
+    max_depth = min(max_depth, board.count(None))  # Deeper than the end of the game is not useful
+    best_action = None
+    depth = 1
+    while depth <= max_depth:
+        try:
+            best_action, best_score = search_root(game, state, depth, deadline, best_action)
+        except SearchTimeout:
+            break
+        if abs(best_score) == 1:  # The game is decided within this depth
+            break
+        depth += 1
+    if best_action is None:  # Not even a one move search finished in time
+        best_action = ordered_children(game, state, game.to_move(state), True)[0][0]
+    return best_action
+
+
+def benchmark():
+    """Times the first move on increasingly large boards."""
+    configurations = [
+        # m, n, k, depth limit, time limit
+        (3, 3, 3, None, None),
+        (4, 4, 3, None, None),
+        (4, 4, 4, 4, None),
+        (5, 5, 4, 3, None),
+        (7, 7, 5, 2, None),
+        (9, 9, 5, None, 1.0),
+        (15, 15, 5, None, 1.0),
+    ]
+    print(f'{"board":>10} {"limit":>10} {"move":>10} {"seconds":>10}')
+    for m, n, k, depth_limit, time_limit in configurations:
+        game = Game(m, n, k)
+        state = game.initial_state()
+        start_time = time.perf_counter()
+        action = alpha_beta_search(game, state, depth_limit, time_limit)
+        end_time = time.perf_counter()
+        if depth_limit is not None:
+            limit = f'depth {depth_limit}'
+        elif time_limit is not None:
+            limit = f'{time_limit:g} s'
+        else:
+            limit = 'full'
+        print(f'{f"{m},{n},{k}":>10} {limit:>10} {str(action):>10} {end_time - start_time:>10.4f}')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,352 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import statistics
+import time
+from typing import Any
+
+from game_engine import LRUCache, SearchEngine
+from mnk_game import Game
+
+# Worker process engines of the most recent board sizes, each with a transposition cache that stays warm
+# between requests. An entry takes roughly 200 bytes plus one byte per cell.
+max_engines = 4
+engines = LRUCache(max_engines)
+worker_cache_size = 1 << 18
+
+# Limits of the queries, so that no query can keep a worker busy indefinitely
+max_cells = 400
+max_time_limit = 10.0
+
+
+def init_worker(cache_size: int):
+    global worker_cache_size
+    worker_cache_size = cache_size
+
+
+def state_key(state: tuple) -> bytes:
+    """Cache key of an mnk_game state: the player to move and the board, one byte each, 2 for empty cells.
+
+    The player and the board determine the window counts and the score, which need not be in the key.
+    """
+    player, board, *_ = state
+    return bytes((player, *(2 if cell is None else cell for cell in board)))
+
+
+def solve(
+    board_size: tuple[int, int, int],
+    board: list[list[int | None]],
+    player: int,
+    depth_limit: int | None,
+    time_limit: float | None,
+) -> dict:
+    """Searches the best move of a position in a worker process."""
+    engine = engines.get(board_size)
+    if engine is None:
+        engine = SearchEngine(Game(*board_size), cache=LRUCache(worker_cache_size), key=state_key)
+        engines[board_size] = engine
+    engine.depth_limit = depth_limit
+    engine.time_limit = time_limit
+    action = engine.search(engine.game.from_board(board, player))
+    return {
+        'move': None if action is None else list(action),
+        'value': engine.value if action is not None else None,
+        'depth': engine.depth,
+        'nodes': engine.nodes,
+        'cache_hits': engine.cache_hits,
+    }
+
+
+def is_integer(value: Any) -> bool:
+    # JSON true and false decode to bools, which are ints to isinstance
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_query(query: Any) -> tuple[tuple, list[list[int | None]], int]:
+    """Validates a decoded query line.
+
+    A query is a JSON object with the board ('board', rows of null, 0 for P1 and 1 for P2), the player to
+    move ('player'), and optionally the number in a row to win ('k', 3 by default), a depth limit ('depth')
+    and a time limit in seconds ('time'). An 'id' is echoed back in the response. Boards have at most
+    max_cells cells, k is at most the longer side of the board, and every search is limited to max_time_limit seconds, which is also the time limit
+    of queries without one.
+
+    Returns
+    -------
+    tuple[tuple, list[list[int | None]], int]
+        The key identifying the search, the board and the player to move
+
+    Raises
+    ------
+    ValueError
+        If the line is not a valid query
+    """
+    if not isinstance(query, dict):
+        raise ValueError('the query must be a JSON object')
+    board = query.get('board')
+    if not isinstance(board, list) or not board or not all(isinstance(row, list) and len(row) == len(board[0]) for row in board):
+        raise ValueError('board must be a non-empty list of equally long rows')
+    if len(board) * len(board[0]) > max_cells:
+        raise ValueError(f'board must have at most {max_cells} cells')
+    if not all(cell is None or is_integer(cell) and cell in (0, 1) for row in board for cell in row):
+        raise ValueError('board cells must be null, 0 or 1')
+    player = query.get('player')
+    if not is_integer(player) or player not in (0, 1):
+        raise ValueError('player must be 0 or 1')
+    k = query.get('k', 3)
+    depth = query.get('depth')
+    time_limit = query.get('time', max_time_limit)
+    if not is_integer(k) or not 1 <= k <= max(len(board), len(board[0])):
+        raise ValueError('k must be a positive integer of at most the length of the longer side of the board')
+    if depth is not None and (not is_integer(depth) or depth < 1):
+        raise ValueError('depth must be a positive integer')
+    if not (is_integer(time_limit) or isinstance(time_limit, float)) or not 0 < time_limit <= max_time_limit:
+        raise ValueError(f'time must be a positive number of at most {max_time_limit} seconds')
+    board_size = (len(board), len(board[0]), k)
+    key = (board_size, tuple(tuple(row) for row in board), player, depth, time_limit)
+    return key, board, player
+
+
+class MoveServer:
+
+    def __init__(self, workers: int = 4, cache_size: int = 1 << 16, worker_cache_size: int = 1 << 18):
+        """Constructs a server answering best move queries for m,n,k positions.
+
+        Parameters
+        ----------
+        workers : int
+            The number of worker processes the searches run in
+        cache_size : int
+            The number of answers kept to reply to repeated queries without searching
+        worker_cache_size : int
+            The number of transposition cache entries of every worker and board size
+        """
+        # Forked workers would inherit the sockets of the connections open at the time, and keep them open
+        self.executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker, initargs=(worker_cache_size,),
+        )
+        self.answers = LRUCache(cache_size)
+        self.in_flight: dict[tuple, asyncio.Future] = {}
+        self.connections: set[asyncio.Task] = set()
+
+        self.requests = 0
+        self.searches = 0
+        self.answer_hits = 0
+        self.coalesced = 0
+
+    def close(self):
+        self.executor.shutdown()
+
+    async def best_move(self, key: tuple, board: list[list[int | None]], player: int) -> dict:
+        answer = self.answers.get(key)
+        if answer is not None:
+            self.answer_hits += 1
+            return answer
+        # Identical queries arriving while the first one is searched wait for its answer
+        if key in self.in_flight:
+            self.coalesced += 1
+            return await asyncio.shield(self.in_flight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            board_size, _, _, depth, time_limit = key
+            self.searches += 1
+            answer = await asyncio.get_running_loop().run_in_executor(
+                self.executor, solve, board_size, board, player, depth, time_limit
+            )
+            self.answers[key] = answer
+            future.set_result(answer)
+        except Exception as exception:
+            future.set_exception(exception)
+            # Mark the exception as retrieved when no other query waited for it
+            future.exception()
+            raise
+        finally:
+            del self.in_flight[key]
+        return answer
+
+    async def wait_connections(self):
+        """Waits until the connections that are open have been closed by their clients."""
+        await asyncio.gather(*self.connections)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            while line := await reader.readline():
+                self.requests += 1
+                query = None
+                try:
+                    query = json.loads(line)
+                    key, board, player = parse_query(query)
+                    response = dict(await self.best_move(key, board, player))
+                except ValueError as exception:
+                    response = {'error': str(exception)}
+                except Exception as exception:
+                    response = {'error': f'search failed: {exception!r}'}
+                if isinstance(query, dict) and 'id' in query:
+                    response['id'] = query['id']
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self.connections.discard(task)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765, path: str | None = None) -> asyncio.AbstractServer:
+        """Starts listening on the Unix socket path if given, otherwise on the TCP host and port."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+def random_positions(count: int, board_size: tuple[int, int, int], max_moves: int, seed: int) -> list[dict]:
+    """Returns count queries of distinct random positions with up to max_moves pieces."""
+    game = Game(*board_size)
+    rng = random.Random(seed)
+    positions = {}
+    while len(positions) < count:
+        state = game.initial_state()
+        for _ in range(rng.randint(0, max_moves)):
+            state = game.result(state, rng.choice(game.actions(state)))
+            if game.is_terminal(state):
+                break
+        if game.is_terminal(state):
+            continue
+        player, flat_board, *_ = state
+        board = [list(flat_board[row * game.n:(row + 1) * game.n]) for row in range(game.m)]
+        positions[flat_board] = {'board': board, 'player': player, 'k': game.k}
+    return list(positions.values())
+
+
+async def load_test(
+    connect,
+    connections: int,
+    requests: int,
+    positions: list[dict],
+    seed: int,
+) -> dict:
+    """Sends requests queries over concurrent connections, each connection waiting for every answer.
+
+    Parameters
+    ----------
+    connect : Callable[[], Awaitable[tuple[asyncio.StreamReader, asyncio.StreamWriter]]]
+        Opens a connection to the server
+    connections : int
+        The number of concurrent connections
+    requests : int
+        The total number of queries
+    positions : list[dict]
+        The queries to choose from at random, so that the same positions are asked for repeatedly
+    seed : int
+        Seed of the choice of queries
+
+    Returns
+    -------
+    dict
+        The latency of every query in seconds, the wall time and the number of errors
+    """
+    rng = random.Random(seed)
+    queries = [dict(rng.choice(positions), id=index) for index in range(requests)]
+    latencies: list[float] = []
+    errors = 0
+
+    async def client(client_queries: list[dict]):
+        nonlocal errors
+        reader, writer = await connect()
+        for query in client_queries:
+            start_time = time.perf_counter()
+            writer.write(json.dumps(query).encode() + b'\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start_time)
+            if 'error' in response:
+                errors += 1
+        writer.close()
+        await writer.wait_closed()
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(client(queries[index::connections]) for index in range(connections)))
+    return {'latencies': latencies, 'wall_time': time.perf_counter() - start_time, 'errors': errors}
+
+
+def check_warm_deepening(board_size: tuple[int, int, int] = (5, 5, 4), time_limit: float = 1.0):
+    """Checks in this process that a time-limited search on a worker engine warmed up by a shallower search
+    of the same position still deepens past it, instead of taking the cached values as the whole game."""
+    m, n, _ = board_size
+    board = [[None] * n for _ in range(m)]
+    solve(board_size, board, 0, 3, max_time_limit)
+    answer = solve(board_size, board, 0, None, time_limit)
+    engines.entries.clear()
+    assert answer['depth'] > 3, f'the warm search stopped at depth {answer["depth"]}'
+    print(f'Warm {board_size} search of {time_limit} s reached depth {answer["depth"]}')
+
+
+async def benchmark(args: argparse.Namespace):
+    check_warm_deepening()
+    server = MoveServer(args.workers)
+    listener = await server.start(args.host, 0, args.unix)
+    if args.unix is not None:
+        connect = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        port = listener.sockets[0].getsockname()[1]
+        connect = lambda: asyncio.open_connection(args.host, port)
+
+    board_size = tuple(int(value) for value in args.board.split(','))
+    cold_positions = random_positions(args.positions, board_size, args.max_moves, args.seed)
+    # The warm round asks for other positions of the same kind, so that it measures the transposition caches
+    # the workers kept from the cold round rather than the answer cache
+    warm_positions = [
+        query for query in random_positions(args.positions, board_size, args.max_moves, args.seed + 1)
+        if query not in cold_positions
+    ]
+    for query in cold_positions + warm_positions:
+        query['depth'] = args.depth
+    async with listener:
+        for round_name, positions in (('cold', cold_positions), ('warm', warm_positions)):
+            searches, answer_hits, coalesced = server.searches, server.answer_hits, server.coalesced
+            results = await load_test(connect, args.connections, args.requests, positions, args.seed)
+            latencies = results['latencies']
+            percentiles = statistics.quantiles(latencies, n=100)
+            print(f'{round_name}: {len(latencies)} requests in {results["wall_time"]:.2f} s, '
+                  f'{len(latencies) / results["wall_time"]:.0f} requests/s, '
+                  f'p50 {percentiles[49] * 1000:.2f} ms, p99 {percentiles[98] * 1000:.2f} ms, {results["errors"]} errors')
+            print(f'    {server.searches - searches} searches, {server.answer_hits - answer_hits} cached answers, '
+                  f'{server.coalesced - coalesced} coalesced queries')
+        await server.wait_connections()
+    server.close()
+
+
+async def serve(args: argparse.Namespace):
+    server = MoveServer(args.workers)
+    listener = await server.start(args.host, args.port, args.unix)
+    print(f'Listening on {args.unix or f"{args.host}:{args.port}"}')
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serves best move queries for m,n,k positions, one JSON object per line.')
+    parser.add_argument('command', choices=['serve', 'bench'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='path of a Unix socket to listen on instead of TCP')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--connections', type=int, default=32, help='bench: concurrent connections')
+    parser.add_argument('--requests', type=int, default=2000, help='bench: number of requests per round')
+    parser.add_argument('--positions', type=int, default=200, help='bench: number of distinct positions')
+    parser.add_argument('--board', default='4,4,4', help='bench: m,n,k of the positions')
+    parser.add_argument('--max-moves', type=int, default=6, help='bench: maximum number of pieces of the positions')
+    parser.add_argument('--depth', type=int, default=3, help='bench: depth limit of the searches')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(serve(args) if args.command == 'serve' else benchmark(args))
@@ -0,0 +1,135 @@
+from concurrent.futures import ProcessPoolExecutor
+import math
+import multiprocessing
+import time
+
+from mnk_game import Action, Game, State, alpha_beta_search, min_value, ordered_children
+
+# Worker process globals, set once per worker by init_worker
+worker_game: Game | None = None
+worker_alpha = None
+
+
+def init_worker(game: Game, shared_alpha):
+    global worker_game, worker_alpha
+    worker_game = game
+    worker_alpha = shared_alpha
+
+
+def search_move(index: int, next_state: State, depth: float, player: int) -> tuple[int, float, float]:
+    """Searches one root move in a worker, starting from the best value found so far by any worker.
+
+    Returns
+    -------
+    tuple[int, float, float]
+        The index of the root move, its value and the alpha bound it was searched with. The value is
+        exact if it is at least the alpha bound, otherwise it is only an upper bound.
+    """
+    alpha = worker_alpha.value
+    # Searching just below alpha makes moves that tie the best value come back with their exact value,
+    # which keeps the choice between equally good moves independent of the order the workers finish in
+    value = min_value(worker_game, next_state, depth - 1, math.nextafter(alpha, -math.inf), math.inf, player, math.inf)
+    with worker_alpha.get_lock():
+        if value > worker_alpha.value:
+            worker_alpha.value = value
+    return index, value, alpha
+
+
+class ParallelSearch:
+
+    def __init__(self, game: Game, workers: int):
+        """Constructs a pool of worker processes searching root moves of the game in parallel.
+
+        Parameters
+        ----------
+        game : Game
+            The game being played, sent to every worker once
+        workers : int
+            The number of worker processes
+        """
+        self.game = game
+        self.workers = workers
+        self.alpha = multiprocessing.Value('d', -math.inf)
+        self.executor = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(game, self.alpha))
+
+    def __enter__(self) -> 'ParallelSearch':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+
+    def alpha_beta_search(self, state: State, depth_limit: int | None = None) -> Action | None:
+        """Chooses an action with alpha-beta search, Young Brothers Wait style.
+
+        The first (most promising) root move is searched sequentially to get a bound, then the remaining
+        root moves are searched by the workers, which share the best value found so far as their alpha.
+        The chosen action is the same as the one of the sequential mnk_game.alpha_beta_search.
+
+        Parameters
+        ----------
+        state : State
+            The state to search from, the player to move is the MAX player
+        depth_limit : int | None
+            The maximum number of moves to look ahead, None for no limit
+
+        Returns
+        -------
+        Action | None
+            The best action found, None if the state is terminal
+        """
+        if self.game.is_terminal(state):
+            return None
+        depth = math.inf if depth_limit is None else depth_limit
+        player = self.game.to_move(state)
+        children = ordered_children(self.game, state, player, True)
+
+        # The eldest brother is searched first, with the full window
+        best_action, first_state = children[0]
+        best_score = min_value(self.game, first_state, depth - 1, -math.inf, math.inf, player, math.inf)
+        self.alpha.value = best_score
+
+        futures = [
+            self.executor.submit(search_move, index, next_state, depth, player)
+            for index, (_, next_state) in enumerate(children[1:], start=1)
+        ]
+        results = sorted(future.result() for future in futures)
+        # Go through the moves in the sequential order, so that ties are broken the same way
+        for index, value, alpha in results:
+            if value >= alpha and value > best_score:
+                best_score = value
+                best_action = children[index][0]
+        return best_action
+
+
+def benchmark():
+    """Compares the time of the first move of the sequential and the parallel search."""
+    configurations = [
+        # m, n, k, depth limit
+        (6, 6, 4, 5),
+        (7, 7, 5, 4),
+        (9, 9, 5, 4),
+    ]
+    print(f'{"board":>10} {"depth":>6} {"workers":>8} {"move":>8} {"seconds":>10} {"speedup":>8}')
+    for m, n, k, depth_limit in configurations:
+        game = Game(m, n, k)
+        state = game.initial_state()
+        start_time = time.perf_counter()
+        sequential_action = alpha_beta_search(game, state, depth_limit)
+        sequential_time = time.perf_counter() - start_time
+        print(f'{f"{m},{n},{k}":>10} {depth_limit:>6} {"-":>8} {str(sequential_action):>8} {sequential_time:>10.4f} {1:>8.2f}')
+        for workers in (1, 2, 4, 8):
+            with ParallelSearch(game, workers) as search:
+                # Warm up the pool, so that starting the workers is not part of the timing
+                search.alpha_beta_search(state, 1)
+                start_time = time.perf_counter()
+                action = search.alpha_beta_search(state, depth_limit)
+                parallel_time = time.perf_counter() - start_time
+            assert action == sequential_action
+            print(f'{f"{m},{n},{k}":>10} {depth_limit:>6} {workers:>8} {str(action):>8} {parallel_time:>10.4f} {sequential_time / parallel_time:>8.2f}')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -1,6 +1,10 @@
 from copy import deepcopy
 import math
 import time
+import sys
+
+from game_engine import negamax_search
+from tic_tac_toe_tablebase import load as load_tablebase
 
 State = tuple[int, list[list[int | None]]]  # Tuple of player (whose turn it is), and board
 Action = tuple[int, int]  # Where to place the player's piece
@@ -115,14 +119,23 @@ def minimax_search(game: Game, state: State) -> Action | None:
 
 
 
-game = Game()
+def main():
+    game = Game()
+    search = negamax_search if '--engine' in sys.argv else minimax_search  # --engine switches to game_engine
+    tablebase = load_tablebase()  # None until the table is built with tic_tac_toe_tablebase.py
 
-state = game.initial_state()
-game.print(state)
-while not game.is_terminal(state):
-    player = game.to_move(state)
-    action = minimax_search(game, state) # The player whose turn it is, is the MAX player
-    print(f'P{player + 1}\'s action : { action }')
-    assert action is not None
-    state = game.result(state, action)
-    game.print(state)
\ No newline at end of file
+    state = game.initial_state()
+    game.print(state)
+    while not game.is_terminal(state):
+        player = game.to_move(state)
+        action = tablebase.best_move(state) if tablebase is not None else None
+        if action is None:
+            action = search(game, state) # The player whose turn it is, is the MAX player
+        print(f'P{player + 1}\'s action : { action }')
+        assert action is not None
+        state = game.result(state, action)
+        game.print(state)
+
+
+if __name__ == '__main__':
+    main()
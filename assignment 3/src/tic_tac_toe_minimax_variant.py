@@ -123,14 +123,19 @@ def minimax_search(game: Game, state: State) -> Action | None:
 
 
 
-game = Game()
-
-state = game.initial_state()
-game.print(state)
-while not game.is_terminal(state):
-    player = game.to_move(state)
-    action = minimax_search(game, state) # The player whose turn it is, is the MAX player
-    print(f'P{player + 1}\'s action : { action }')
-    assert action is not None
-    state = game.result(state, action)
-    game.print(state)
\ No newline at end of file
+def main():
+    game = Game()
+
+    state = game.initial_state()
+    game.print(state)
+    while not game.is_terminal(state):
+        player = game.to_move(state)
+        action = minimax_search(game, state) # The player whose turn it is, is the MAX player
+        print(f'P{player + 1}\'s action : { action }')
+        assert action is not None
+        state = game.result(state, action)
+        game.print(state)
+
+
+if __name__ == '__main__':
+    main()
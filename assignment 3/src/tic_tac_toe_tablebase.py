@@ -0,0 +1,142 @@
+import mmap
+import os
+
+State = tuple[int, list[list[int | None]]]  # Tuple of player (whose turn it is), and board
+Action = tuple[int, int]  # Where to place the player's piece
+
+# The table has one byte per base 3 board index (empty = 0, P1 = 1, P2 = 2 for each of the 9 cells),
+# which is a perfect index: the player to move follows from the number of pieces on the board.
+# The low 4 bits of an entry are the best cell (row * 3 + col, NO_MOVE for terminal positions),
+# the next 2 bits are the value for the player to move plus one. Unreachable positions are UNREACHABLE.
+TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tic_tac_toe_tablebase.bin')
+MAGIC = b'TTT1'
+TABLE_SIZE = 3 ** 9
+NO_MOVE = 0xF
+UNREACHABLE = 0xFF
+
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+POWERS = [3 ** cell for cell in range(9)]
+
+
+def winner(cells: list[int]) -> int:
+    """Returns the cell code (1 or 2) of the player with three in a row, 0 if there is none."""
+    for a, b, c in LINES:
+        if cells[a] != 0 and cells[a] == cells[b] == cells[c]:
+            return cells[a]
+    return 0
+
+
+def board_index(state: State) -> int:
+    _, board = state
+    index = 0
+    for row in range(3):
+        for col in range(3):
+            if board[row][col] is not None:
+                index += (board[row][col] + 1) * POWERS[row * 3 + col]
+    return index
+
+
+def build(path: str = TABLEBASE_PATH) -> int:
+    """Solves every reachable position by retrograde analysis and writes the table to path.
+
+    Returns
+    -------
+    int
+        The number of reachable positions
+    """
+    # Enumerate the reachable positions layer by layer, a layer being the positions with the same number of pieces
+    layers: list[set[int]] = [{0}]
+    for pieces in range(9):
+        code = pieces % 2 + 1  # P1 (code 1) moves when the number of pieces is even
+        next_layer = set()
+        for index in layers[pieces]:
+            cells = [index // POWERS[cell] % 3 for cell in range(9)]
+            if winner(cells):
+                continue
+            for cell in range(9):
+                if cells[cell] == 0:
+                    next_layer.add(index + code * POWERS[cell])
+        layers.append(next_layer)
+
+    # Solve backwards from the full boards, every child is already solved when its parent is reached
+    table = bytearray([UNREACHABLE]) * TABLE_SIZE
+    values: dict[int, int] = {}
+    for pieces in range(9, -1, -1):
+        code = pieces % 2 + 1
+        for index in layers[pieces]:
+            cells = [index // POWERS[cell] % 3 for cell in range(9)]
+            if winner(cells):  # The previous player completed a line
+                value, best_cell = -1, NO_MOVE
+            elif pieces == 9:
+                value, best_cell = 0, NO_MOVE
+            else:
+                value, best_cell = -2, NO_MOVE
+                # The first best cell in row-major order, the same action minimax_search chooses
+                for cell in range(9):
+                    if cells[cell] == 0:
+                        child_value = -values[index + code * POWERS[cell]]
+                        if child_value > value:
+                            value, best_cell = child_value, cell
+            values[index] = value
+            table[index] = (value + 1) << 4 | best_cell
+
+    with open(path, 'wb') as file:
+        file.write(MAGIC)
+        file.write(table)
+    return len(values)
+
+
+class Tablebase:
+
+    def __init__(self, path: str = TABLEBASE_PATH):
+        """Memory-maps the table written by build().
+
+        Parameters
+        ----------
+        path : str
+            The path of the table
+        """
+        with open(path, 'rb') as file:
+            self.table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.table[:len(MAGIC)] != MAGIC or len(self.table) != len(MAGIC) + TABLE_SIZE:
+            self.table.close()
+            raise ValueError(f'{path} is not a tic-tac-toe tablebase')
+
+    def close(self):
+        self.table.close()
+
+    def lookup(self, state: State) -> tuple[Action | None, int] | None:
+        """Looks up the best action and the value of the state for the player to move.
+
+        Returns
+        -------
+        tuple[Action | None, int] | None
+            The best action (None if the state is terminal) and the value (1 win, 0 draw, -1 loss),
+            or None if the state cannot be reached in a game starting from the empty board
+        """
+        player, board = state
+        entry = self.table[len(MAGIC) + board_index(state)]
+        if entry == UNREACHABLE:
+            return None
+        pieces = sum(cell is not None for row in board for cell in row)
+        if player != pieces % 2:
+            return None
+        best_cell = entry & 0xF
+        value = (entry >> 4) - 1
+        return (None if best_cell == NO_MOVE else divmod(best_cell, 3)), value
+
+    def best_move(self, state: State) -> Action | None:
+        entry = self.lookup(state)
+        return None if entry is None else entry[0]
+
+
+def load(path: str = TABLEBASE_PATH) -> Tablebase | None:
+    """Returns the tablebase at path, or None if it has not been built."""
+    if not os.path.exists(path):
+        return None
+    return Tablebase(path)
+
+
+if __name__ == '__main__':
+    positions = build()
+    print(f'Solved {positions} positions into {TABLEBASE_PATH}')
@@ -0,0 +1,175 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import random
+import statistics
+import time
+
+from game_engine import SearchEngine
+from mnk_game import Game, State
+
+# The preset board of tic_tac_toe_minimax_variant.py, with P1 to move
+PRESET_BOARD = [[0, 1, 1], [0, None, None], [None, None, None]]
+
+# Worker process cache of games, so that the window tables are only built once per board size
+games: dict[tuple[int, int, int], Game] = {}
+
+
+def opening_state(game: Game, opening: str, random_moves: int, rng: random.Random) -> State:
+    """Returns the state a game starts from.
+
+    Parameters
+    ----------
+    game : Game
+        The game being played
+    opening : str
+        'empty' for the empty board, 'preset' for the preset board of the tic-tac-toe variant and 'random'
+        for random_moves random moves from the empty board
+    random_moves : int
+        The number of random moves of a random opening
+    rng : random.Random
+        The random number generator of a random opening
+    """
+    if opening == 'empty':
+        return game.initial_state()
+    if opening == 'preset':
+        assert (game.m, game.n) == (3, 3), 'The preset opening is a 3 x 3 board'
+        return game.from_board(PRESET_BOARD, 0)
+    assert opening == 'random'
+    while True:
+        state = game.initial_state()
+        for _ in range(random_moves):
+            state = game.result(state, rng.choice(game.actions(state)))
+            if game.is_terminal(state):
+                break
+        # Openings that already decided the game are drawn again
+        if not game.is_terminal(state):
+            return state
+
+
+def play_game(task: dict) -> dict:
+    """Plays one engine-vs-engine game, engine A playing P1 in even and P2 in odd games.
+
+    Returns
+    -------
+    dict
+        The score of engine A (1 win, 0 draw, -1 loss), and the think time and number of nodes of every move
+        of both engines
+    """
+    board = task['board']
+    if board not in games:
+        games[board] = Game(*board)
+    game = games[board]
+    rng = random.Random(task['seed'])
+    state = opening_state(game, task['opening'], task['random_moves'], rng)
+
+    # Each engine keeps its own cache for the whole game
+    engines = [SearchEngine(game, cache={} if options.pop('cache') else None, **options) for options in
+               (dict(task['engine_a']), dict(task['engine_b']))]
+    if task['index'] % 2 == 1:
+        engines.reverse()
+    a_player = task['index'] % 2
+    think_times: list[list[float]] = [[], []]
+    nodes: list[list[int]] = [[], []]
+    while not game.is_terminal(state):
+        player = game.to_move(state)
+        engine = engines[player]
+        action = engine.search(state)
+        engine_index = 0 if player == a_player else 1
+        think_times[engine_index].append(engine.elapsed)
+        nodes[engine_index].append(engine.nodes)
+        state = game.result(state, action)
+    return {'score': game.utility(state, a_player), 'think_times': think_times, 'nodes': nodes}
+
+
+def run_tournament(
+    games_count: int,
+    workers: int,
+    board: tuple[int, int, int],
+    opening: str,
+    random_moves: int,
+    seed: int,
+    engine_a: dict,
+    engine_b: dict,
+) -> dict:
+    """Plays games_count games of engine A against engine B across a pool of worker processes.
+
+    Engines are given as SearchEngine keyword options, plus 'cache': whether the engine keeps a memo cache.
+    Game i of the tournament uses seed + i for its random opening, so tournaments are reproducible.
+
+    Returns
+    -------
+    dict
+        Aggregated results: win/draw/loss counts of engine A, wall time, games per second, and per engine
+        the average think time per move and the nodes per second of every move
+    """
+    tasks = [
+        {
+            'index': index, 'board': board, 'opening': opening, 'random_moves': random_moves, 'seed': seed + index,
+            'engine_a': engine_a, 'engine_b': engine_b,
+        }
+        for index in range(games_count)
+    ]
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(workers) as executor:
+        # Games are many and short, sending them in chunks keeps the pool overhead down
+        results = list(executor.map(play_game, tasks, chunksize=max(1, games_count // (workers * 4))))
+    wall_time = time.perf_counter() - start_time
+
+    summary = {
+        'wins': sum(result['score'] > 0 for result in results),
+        'draws': sum(result['score'] == 0 for result in results),
+        'losses': sum(result['score'] < 0 for result in results),
+        'wall_time': wall_time,
+        'games_per_second': games_count / wall_time,
+        'engines': [],
+    }
+    for engine_index in range(2):
+        think_times = [t for result in results for t in result['think_times'][engine_index]]
+        nodes = [n for result in results for n in result['nodes'][engine_index]]
+        summary['engines'].append({
+            'moves': len(think_times),
+            'average_think_time': statistics.fmean(think_times) if think_times else 0.0,
+            'nodes_per_second': [n / t for n, t in zip(nodes, think_times) if t > 0],
+        })
+    return summary
+
+
+def print_summary(summary: dict, games_count: int, workers: int):
+    print(f'{games_count} games in {summary["wall_time"]:.2f} s with {workers} workers: '
+          f'{summary["games_per_second"]:.1f} games/s')
+    print(f'Engine A: {summary["wins"]} wins, {summary["draws"]} draws, {summary["losses"]} losses')
+    for name, engine in zip('AB', summary['engines']):
+        print(f'Engine {name}: {engine["moves"]} moves, {engine["average_think_time"] * 1000:.3f} ms average think time')
+        nps = engine['nodes_per_second']
+        if len(nps) >= 2:
+            deciles = statistics.quantiles(nps, n=10)
+            print(f'    nodes/s min {min(nps):.0f}, p10 {deciles[0]:.0f}, median {statistics.median(nps):.0f}, '
+                  f'p90 {deciles[-1]:.0f}, max {max(nps):.0f}')
+
+
+def engine_options(depth: int | None, time_limit: float | None, node_limit: int | None, cache: bool) -> dict:
+    return {'depth_limit': depth, 'time_limit': time_limit, 'node_limit': node_limit, 'cache': cache}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Plays engine-vs-engine m,n,k games across a process pool.')
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--board', default='3,3,3', help='m,n,k')
+    parser.add_argument('--opening', choices=['empty', 'preset', 'random'], default='random')
+    parser.add_argument('--random-moves', type=int, default=2, help='number of random moves of a random opening')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--depth-a', type=int, default=None, help='depth limit of engine A, none by default')
+    parser.add_argument('--depth-b', type=int, default=None, help='depth limit of engine B, none by default')
+    parser.add_argument('--time-limit', type=float, default=None, help='seconds per move of both engines')
+    parser.add_argument('--node-limit', type=int, default=None, help='nodes per move of both engines')
+    parser.add_argument('--no-cache', action='store_true', help='search without memo caches')
+    args = parser.parse_args()
+
+    board = tuple(int(value) for value in args.board.split(','))
+    summary = run_tournament(
+        args.games, args.workers, board, args.opening, args.random_moves, args.seed,
+        engine_options(args.depth_a, args.time_limit, args.node_limit, not args.no_cache),
+        engine_options(args.depth_b, args.time_limit, args.node_limit, not args.no_cache),
+    )
+    print_summary(summary, args.games, args.workers)
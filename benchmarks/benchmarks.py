@@ -0,0 +1,249 @@
+# Benchmark suite of the CSP solvers of assignment 2 and the game searches of assignment 3.
+#
+#   python benchmarks/benchmarks.py run --output results.json
+#   python benchmarks/benchmarks.py compare baseline.json results.json
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSP_DIR = os.path.join(ROOT, 'assignment 2', 'src')
+GAMES_DIR = os.path.join(ROOT, 'assignment 3', 'src')
+sys.path[:0] = [CSP_DIR, GAMES_DIR]
+
+SUDOKUS = ['sudoku_easy.txt', 'sudoku_medium.txt', 'sudoku_hard.txt', 'sudoku_very_hard.txt']
+
+
+class CountingGame:
+    """Wraps a game to count the nodes a search generates, as the number of calls to result()."""
+
+    def __init__(self, game):
+        self.game = game
+        self.nodes = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.game, name)
+
+    def result(self, state, action):
+        self.nodes += 1
+        return self.game.result(state, action)
+
+
+# A benchmark is a function preparing a run: it returns the function to time, which returns the node count.
+# Preparing (building a CSP, a game) is not part of the timing.
+
+def sudoku_ac_3(name: str) -> Callable[[], Callable[[], int]]:
+    def prepare():
+        from sudoku import build_csp, load_grid
+        csp = build_csp(load_grid(os.path.join(CSP_DIR, name)))
+        csp.binary_constraints  # Built on first use, which is preparation rather than AC-3
+
+        # AC-3 has no node counter, the number of values left in the domains stands in for it
+        def run() -> int:
+            csp.ac_3()
+            return sum(len(domain) for domain in csp.domains.values())
+        return run
+    return prepare
+
+
+def sudoku_backtracking(name: str) -> Callable[[], Callable[[], int]]:
+    def prepare():
+        from sudoku import build_csp, load_grid
+        csp = build_csp(load_grid(os.path.join(CSP_DIR, name)))
+        csp.binary_constraints
+        csp.ac_3()
+
+        def run() -> int:
+            with contextlib.redirect_stdout(io.StringIO()):  # backtracking_search prints its counters
+                csp.backtracking_search()
+            return csp.backtrack_calls
+        return run
+    return prepare
+
+
+def map_coloring() -> Callable[[], int]:
+    from map_coloring import build_csp
+    csp = build_csp()
+    csp.binary_constraints
+
+    def run() -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            csp.backtracking_search()
+        return csp.backtrack_calls
+    return run
+
+
+def game_search(module_name: str, search_name: str, *game_args) -> Callable[[], Callable[[], int]]:
+    def prepare():
+        module = importlib.import_module(module_name)
+        game = CountingGame(module.Game(*game_args))
+        search = getattr(module, search_name)
+
+        def run() -> int:
+            game.nodes = 0
+            with contextlib.redirect_stdout(io.StringIO()):  # alpha_beta_search prints its time
+                search(game, game.initial_state())
+            return game.nodes
+        return run
+    return prepare
+
+
+def module_import(module_name: str) -> Callable[[], Callable[[], int]]:
+    def prepare():
+        directory = CSP_DIR if os.path.exists(os.path.join(CSP_DIR, f'{module_name}.py')) else GAMES_DIR
+
+        # Startup and import time of a fresh interpreter, the count is the number of modules it ends up with
+        def run() -> int:
+            output = subprocess.run(
+                [sys.executable, '-c', f'import sys; import {module_name}; print(len(sys.modules))'],
+                cwd=directory, capture_output=True, text=True, check=True,
+            ).stdout
+            return int(output.split()[-1])
+        return run
+    return prepare
+
+
+IMPORTED_MODULES = [
+    'csp', 'sudoku', 'map_coloring', 'bucket_game', 'halving_game', 'tic_tac_toe_minimax',
+    'tic_tac_toe_minimax_variant', 'tic_tac_toe_alpha_beta_pruning', 'mnk_game', 'game_engine',
+]
+
+
+# Name, preparation, number of timed runs (None for the --repeat option)
+BENCHMARKS: list[tuple[str, Callable[[], Callable[[], int]], int | None]] = [
+    *[(f'csp/ac_3/{name[:-4]}', sudoku_ac_3(name), None) for name in SUDOKUS],
+    *[(f'csp/backtracking_search/{name[:-4]}', sudoku_backtracking(name), None) for name in SUDOKUS],
+    ('csp/backtracking_search/map_coloring', map_coloring, None),
+    ('games/bucket_game/minimax_search', game_search('bucket_game', 'minimax_search'), None),
+    ('games/halving_game/minimax_search/50', game_search('halving_game', 'minimax_search', 50), None),
+    ('games/tic_tac_toe/minimax_search', game_search('tic_tac_toe_minimax', 'minimax_search'), 3),
+    ('games/tic_tac_toe_variant/minimax_search', game_search('tic_tac_toe_minimax_variant', 'minimax_search'), None),
+    ('games/tic_tac_toe/alpha_beta_search', game_search('tic_tac_toe_alpha_beta_pruning', 'alpha_beta_search'), None),
+    *[(f'import/{name}', module_import(name), None) for name in IMPORTED_MODULES],
+]
+
+
+def measure(prepare: Callable[[], Callable[[], int]], warmup: int, repeat: int, memory: bool) -> dict:
+    """Times repeat runs after warmup runs, each run with a freshly prepared state.
+
+    Returns
+    -------
+    dict
+        The run times in seconds with their median, minimum, maximum and standard deviation, the node count
+        of the last run, and the peak memory allocated by an extra run traced with tracemalloc
+    """
+    for _ in range(warmup):
+        prepare()()
+    times = []
+    for _ in range(repeat):
+        run = prepare()
+        start_time = time.perf_counter()
+        nodes = run()
+        times.append(time.perf_counter() - start_time)
+    result = {
+        'median': statistics.median(times),
+        'min': min(times),
+        'max': max(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'times': times,
+        'nodes': nodes,
+    }
+    if memory:
+        run = prepare()
+        tracemalloc.start()
+        run()
+        result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(args: argparse.Namespace):
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'warmup': args.warmup,
+            'repeat': args.repeat,
+        },
+        'benchmarks': {},
+    }
+    for name, prepare, repeat in BENCHMARKS:
+        if args.filter and args.filter not in name:
+            continue
+        # The imports run in another process, there is nothing to trace in this one
+        memory = not args.no_memory and not name.startswith('import/')
+        result = measure(prepare, args.warmup, repeat or args.repeat, memory)
+        results['benchmarks'][name] = result
+        memory = f'{result["peak_memory"] / 1024:10.0f} KiB' if 'peak_memory' in result else ''
+        print(f'{name:<45} {result["median"]:10.6f} s  ±{result["stdev"]:9.6f} {result["nodes"]:>10} nodes {memory}')
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Prints the changes between two result files and returns the number of regressions.
+
+    A benchmark regresses if its median time grows by more than the threshold and by more than the spread
+    (max - min) of the baseline runs, if its node count changes, or if its peak memory grows by more than
+    the threshold.
+    """
+    with open(args.baseline) as file:
+        baseline = json.load(file)['benchmarks']
+    with open(args.current) as file:
+        current = json.load(file)['benchmarks']
+
+    regressions = 0
+    for name, result in current.items():
+        if name not in baseline:
+            print(f'{name:<45} new')
+            continue
+        base = baseline[name]
+        ratio = result['median'] / base['median']
+        problems = []
+        if ratio > 1 + args.threshold and result['median'] - base['median'] > base['max'] - base['min']:
+            problems.append('slower')
+        if result['nodes'] != base['nodes']:
+            problems.append(f'nodes {base["nodes"]} -> {result["nodes"]}')
+        if 'peak_memory' in result and 'peak_memory' in base and \
+                result['peak_memory'] > base['peak_memory'] * (1 + args.threshold):
+            problems.append(f'memory {base["peak_memory"] / 1024:.0f} -> {result["peak_memory"] / 1024:.0f} KiB')
+        regressions += bool(problems)
+        status = 'REGRESSION: ' + ', '.join(problems) if problems else 'ok'
+        print(f'{name:<45} {base["median"]:10.6f} s -> {result["median"]:10.6f} s ({ratio:6.2f}x)  {status}')
+    for name in baseline.keys() - current.keys():
+        print(f'{name:<45} missing')
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the CSP solvers and the game searches.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--output', help='JSON file to save the results to')
+    run_parser.add_argument('--warmup', type=int, default=1, help='untimed runs before the timed ones')
+    run_parser.add_argument('--repeat', type=int, default=5, help='timed runs')
+    run_parser.add_argument('--filter', help='only run the benchmarks with this in their name')
+    run_parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    compare_parser = subparsers.add_parser('compare', help='compare results with a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='relative growth that counts as a regression')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        run_benchmarks(args)
+    else:
+        sys.exit(1 if compare(args) else 0)